@@ -26,6 +26,15 @@ GAME_MUSIC = "bgm"
 _bg_music_started = False
 _last_sound_fallback = None
 
+# Piloto automático (bot): liga ao iniciar com pgzrun; F2 alterna durante o jogo
+AUTOPLAY = False
+AUTOPLAY_SKILL = 0.8
+AUTOPLAY_INVULNERABLE = False
+
+# Projéteis do jogador: velocidade (px/quadro) e quantos inimigos extras atravessam
+PROJECTILE_SPEED = 12
+PROJECTILE_PIERCE = 0
+
 # Função utilitária: limita um valor ao intervalo [a, b]
 def clamp(v, a, b):
     return max(a, min(b, v))
@@ -138,6 +147,7 @@ class Hero(Character):
         self.hurt_cooldown = 0
         self.speed = 5.5
         self.fire_cooldown = 0
+        self.invulnerable = False
         self.state = "idle"
         self.current_frame = 0
         self.frame_timer = 0
@@ -270,10 +280,12 @@ class Enemy(Character):
             screen.draw.filled_circle((int(self.x), int(self.y)), 10, (220, 70, 70))
 
 class Projectile:
-    # Construtor do projétil: posição, direção, velocidade, vida e dano
-    def __init__(self, x, y, vx, vy, speed=12, life_frames=120, damage=1):
+    # Construtor do projétil: posição, direção, velocidade, vida, dano e perfuração
+    def __init__(self, x, y, vx, vy, speed=12, life_frames=120, damage=1, pierce=0):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         mag = math.hypot(vx, vy)
         if mag == 0:
             self.vx = 0
@@ -285,11 +297,16 @@ class Projectile:
         self.damage = damage
         self.alive = True
         self.radius = 5
+        self.pierce = pierce
+        # inimigos já atingidos (evita acertar o mesmo inimigo em quadros seguidos)
+        self.hit = set()
 
     # Atualiza posição do projétil e decremente sua vida
     def update(self):
         if not self.alive:
             return
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += self.vx
         self.y += self.vy
         self.life -= 1
@@ -304,11 +321,241 @@ class Projectile:
             return
         screen.draw.filled_circle((int(self.x), int(self.y)), self.radius, (255, 240, 120))
 
-    # Verifica colisão do projétil com um inimigo
-    def collides_with_enemy(self, enemy):
-        dx = self.x - enemy.x
-        dy = self.y - enemy.y
-        return math.hypot(dx, dy) < (self.radius + 12)
+    # Colisão contínua: retorna [(t, inimigo)] atingidos no trajeto deste quadro,
+    # ordenados pelo instante de impacto t em [0, 1]
+    def sweep_hits(self, grid):
+        x0 = self.prev_x
+        y0 = self.prev_y
+        dx = self.x - x0
+        dy = self.y - y0
+        reach = self.radius + 12
+        a = dx * dx + dy * dy
+        hits = []
+        for e in grid.query_segment(x0, y0, self.x, self.y):
+            if e in self.hit or not is_targetable(e):
+                continue
+            fx = x0 - e.x
+            fy = y0 - e.y
+            c = fx * fx + fy * fy - reach * reach
+            if c < 0:
+                # já começou o quadro encostado no inimigo
+                hits.append((0.0, e))
+                continue
+            b = fx * dx + fy * dy
+            if a == 0 or b >= 0:
+                continue
+            disc = b * b - a * c
+            if disc < 0:
+                continue
+            t = (-b - math.sqrt(disc)) / a
+            if t <= 1:
+                hits.append((t, e))
+        hits.sort(key=lambda h: h[0])
+        return hits
+
+class SpatialGrid:
+    # Construtor da grade espacial: agrupa entidades por células de TILE px
+    def __init__(self, cell=TILE):
+        self.cell = cell
+        self.cells = {}
+        # limites (r_min, r_max, c_min, c_max) das células ocupadas
+        self.bounds = None
+
+    # Reconstrói a grade a partir de uma lista de entidades (com x, y)
+    def build(self, items):
+        self.cells = {}
+        for it in items:
+            key = (int(it.y // self.cell), int(it.x // self.cell))
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [it]
+            else:
+                bucket.append(it)
+        if self.cells:
+            rows = [r for r, _ in self.cells]
+            cols = [c for _, c in self.cells]
+            self.bounds = (min(rows), max(rows), min(cols), max(cols))
+        else:
+            self.bounds = None
+
+    # Retorna as entidades das células que cobrem o círculo (x, y, radius)
+    def query(self, x, y, radius):
+        r0 = int((y - radius) // self.cell)
+        r1 = int((y + radius) // self.cell)
+        c0 = int((x - radius) // self.cell)
+        c1 = int((x + radius) // self.cell)
+        found = []
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                bucket = self.cells.get((r, c))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    # Retorna as células (r, c) cruzadas pelo segmento, em ordem (travessia DDA)
+    def segment_cells(self, x0, y0, x1, y1):
+        r = int(y0 // self.cell)
+        c = int(x0 // self.cell)
+        r_end = int(y1 // self.cell)
+        c_end = int(x1 // self.cell)
+        dx = x1 - x0
+        dy = y1 - y0
+        step_c = 1 if dx > 0 else -1
+        step_r = 1 if dy > 0 else -1
+        if dx != 0:
+            t_max_x = ((c + (1 if dx > 0 else 0)) * self.cell - x0) / dx
+            t_delta_x = self.cell / abs(dx)
+        else:
+            t_max_x = t_delta_x = float("inf")
+        if dy != 0:
+            t_max_y = ((r + (1 if dy > 0 else 0)) * self.cell - y0) / dy
+            t_delta_y = self.cell / abs(dy)
+        else:
+            t_max_y = t_delta_y = float("inf")
+        cells = [(r, c)]
+        # número exato de passos evita laço infinito por erro de ponto flutuante
+        for _ in range(abs(r_end - r) + abs(c_end - c)):
+            if t_max_x < t_max_y:
+                c += step_c
+                t_max_x += t_delta_x
+            else:
+                r += step_r
+                t_max_y += t_delta_y
+            cells.append((r, c))
+        return cells
+
+    # Retorna as entidades perto do segmento: células cruzadas e suas vizinhas
+    # (vale para raios de colisão menores que uma célula)
+    def query_segment(self, x0, y0, x1, y1):
+        seen = set()
+        found = []
+        for r, c in self.segment_cells(x0, y0, x1, y1):
+            for nr in (r - 1, r, r + 1):
+                for nc in (c - 1, c, c + 1):
+                    if (nr, nc) in seen:
+                        continue
+                    seen.add((nr, nc))
+                    bucket = self.cells.get((nr, nc))
+                    if bucket:
+                        found.extend(bucket)
+        return found
+
+    # Retorna a entidade mais próxima de (x, y), buscando em anéis de células
+    def nearest(self, x, y, accept=None):
+        if not self.cells:
+            return None
+        cr = int(y // self.cell)
+        cc = int(x // self.cell)
+        r_min, r_max, c_min, c_max = self.bounds
+        # além das células ocupadas os anéis estão vazios
+        last_ring = max(cr - r_min, r_max - cr, cc - c_min, c_max - cc, 0)
+        best = None
+        best_d = float("inf")
+        for ring in range(last_ring + 1):
+            for r, c in self.ring_cells(cr, cc, ring):
+                for it in self.cells.get((r, c), ()):
+                    if accept and not accept(it):
+                        continue
+                    d = math.hypot(it.x - x, it.y - y)
+                    if d < best_d:
+                        best = it
+                        best_d = d
+            # nada no próximo anel pode estar mais perto que ring * cell
+            if best is not None and best_d <= ring * self.cell:
+                break
+        return best
+
+    # Retorna as células da borda do anel `ring` ao redor de (cr, cc), limitadas às ocupadas
+    def ring_cells(self, cr, cc, ring):
+        if ring == 0:
+            return [(cr, cc)]
+        r_min, r_max, c_min, c_max = self.bounds
+        cells = []
+        c0 = max(cc - ring, c_min)
+        c1 = min(cc + ring, c_max)
+        for r in (cr - ring, cr + ring):
+            if r_min <= r <= r_max:
+                for c in range(c0, c1 + 1):
+                    cells.append((r, c))
+        r0 = max(cr - ring + 1, r_min)
+        r1 = min(cr + ring - 1, r_max)
+        for c in (cc - ring, cc + ring):
+            if c_min <= c <= c_max:
+                for r in range(r0, r1 + 1):
+                    cells.append((r, c))
+        return cells
+
+# Retorna True se o inimigo ainda pode ser alvo (vivo e fora da animação de morte)
+def is_targetable(e):
+    return e.alive and getattr(e, "state", None) != "die"
+
+class AutoPilot:
+    # Construtor do piloto automático: habilidade (0..1) e invencibilidade
+    def __init__(self, skill=AUTOPLAY_SKILL, invulnerable=AUTOPLAY_INVULNERABLE):
+        self.skill = clamp(skill, 0.0, 1.0)
+        self.invulnerable = invulnerable
+        self.move = (0, 0)
+        self.think_timer = 0
+        self.danger_radius = TILE * 2
+
+    # Soma a ameaça dos inimigos próximos ao centro da célula (r, c)
+    def threat(self, r, c):
+        x = c * TILE + TILE // 2
+        y = r * TILE + TILE // 2
+        total = 0.0
+        for e in enemy_grid.query(x, y, self.danger_radius):
+            if not is_targetable(e):
+                continue
+            d = math.hypot(e.x - x, e.y - y)
+            if d < self.danger_radius:
+                total += self.danger_radius - d
+        # bordas são becos sem saída: penaliza um pouco
+        if r in (0, ROWS - 1) or c in (0, COLS - 1):
+            total += TILE * 0.25
+        return total
+
+    # Escolhe a célula vizinha (ou ficar parado) com menor ameaça
+    def choose_move(self):
+        if random.random() > self.skill:
+            return random.choice([(0, 0), (-1, 0), (1, 0), (0, -1), (0, 1)])
+        best = (0, 0)
+        best_t = self.threat(player.row, player.col)
+        for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            r = player.row + dr
+            c = player.col + dc
+            if not (0 <= r < ROWS and 0 <= c < COLS):
+                continue
+            t = self.threat(r, c)
+            if t < best_t:
+                best = (dr, dc)
+                best_t = t
+        return best
+
+    # Decide mira, disparo, movimento e dash para o quadro atual
+    def think(self):
+        global mouse_held, last_mouse_pos
+        player.invulnerable = self.invulnerable
+        # habilidade baixa reage com atraso
+        if self.think_timer > 0:
+            self.think_timer -= 1
+            return
+        self.think_timer = int((1.0 - self.skill) * 12)
+        target = enemy_grid.nearest(player.x, player.y, is_targetable)
+        if target is None:
+            mouse_held = False
+        else:
+            err = (1.0 - self.skill) * TILE
+            last_mouse_pos = (target.x + random.uniform(-err, err),
+                              target.y + random.uniform(-err, err))
+            mouse_held = True
+        self.move = self.choose_move()
+        # dash (SPACE) apenas na direção em que já está olhando, se houver perigo
+        facing_dir = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+        if (player.at_target() and self.move != (0, 0)
+                and facing_dir.get(player.facing) == self.move
+                and self.threat(player.row, player.col) > TILE
+                and random.random() < self.skill):
+            on_key_down(keys.SPACE)
 
 player = Hero(3, 3)
 enemies = [Enemy(4, 10), Enemy(8, 6), Enemy(10, 12)]
@@ -329,6 +576,29 @@ kills = 0
 kills_to_next_level = 10
 spawn_batch = 1
 
+autopilot = AutoPilot() if AUTOPLAY else None
+# grade de inimigos compartilhada, reconstruída uma vez por quadro em update()
+# depois do movimento dos inimigos e usada pela colisão dos projéteis. O piloto
+# automático pensa no início do quadro, então enxerga os inimigos do quadro
+# anterior: novos spawns só aparecem no próximo.
+enemy_grid = SpatialGrid()
+
+# Reinicia jogador, inimigos e parâmetros de spawn para uma nova partida
+def reset_game():
+    global player, enemies, projectiles
+    global spawn_timer, spawn_interval, spawn_batch
+    global level, kills, kills_to_next_level
+    player = Hero(3, 3)
+    enemies = [Enemy(4, 10), Enemy(8, 6), Enemy(10, 12)]
+    projectiles = []
+    spawn_timer = 0
+    spawn_interval = 180
+    spawn_batch = 1
+    level = 1
+    kills = 0
+    kills_to_next_level = 10
+    enemy_grid.build(enemies)
+
 # Incrementa o nível e ajusta parâmetros de spawn
 def level_up():
     global level, spawn_batch, spawn_interval, kills_to_next_level
@@ -407,30 +677,42 @@ def toggle_sound():
         except Exception:
             _last_sound_fallback = None
 
+# Lê a direção de movimento em células (setas/WASD ou piloto automático)
+def read_move_input():
+    if autopilot is not None:
+        return autopilot.move
+    try:
+        if keyboard[keys.UP] or keyboard[keys.W]:
+            return (-1, 0)
+        elif keyboard[keys.DOWN] or keyboard[keys.S]:
+            return (1, 0)
+        elif keyboard[keys.LEFT] or keyboard[keys.A]:
+            return (0, -1)
+        elif keyboard[keys.RIGHT] or keyboard[keys.D]:
+            return (0, 1)
+    except Exception:
+        pass
+    return (0, 0)
+
 # Função principal de atualização do jogo (lógica, movimentação, colisões, spawn)
 def update():
     global game_state, enemies, projectiles, spawn_timer, spawn_interval, kills, mouse_held, last_mouse_pos
     if game_state == STATE_MENU:
         return
     if game_state == STATE_PLAYING:
+        if autopilot is not None:
+            autopilot.think()
         if player.at_target():
-            try:
-                if keyboard[keys.UP] or keyboard[keys.W]:
-                    player.set_target(player.row - 1, player.col)
-                elif keyboard[keys.DOWN] or keyboard[keys.S]:
-                    player.set_target(player.row + 1, player.col)
-                elif keyboard[keys.LEFT] or keyboard[keys.A]:
-                    player.set_target(player.row, player.col - 1)
-                elif keyboard[keys.RIGHT] or keyboard[keys.D]:
-                    player.set_target(player.row, player.col + 1)
-            except Exception:
-                pass
+            dr, dc = read_move_input()
+            if dr or dc:
+                player.set_target(player.row + dr, player.col + dc)
         player.update()
         if mouse_held and player.fire_cooldown == 0:
             mx, my = last_mouse_pos
             sx = player.x; sy = player.y
             vx = mx - sx; vy = my - sy
-            proj = Projectile(sx, sy, vx, vy, speed=12, life_frames=120, damage=1)
+            proj = Projectile(sx, sy, vx, vy, speed=PROJECTILE_SPEED, life_frames=120,
+                              damage=1, pierce=PROJECTILE_PIERCE)
             projectiles.append(proj)
             player.fire_cooldown = 8
             try:
@@ -448,43 +730,30 @@ def update():
             e.update()
         for p in projectiles:
             p.update()
+        enemy_grid.build(enemies)
 
         died_now = []
 
+        # colisão contínua: todo projétil da lista estava vivo no início do quadro,
+        # então testamos o trajeto inteiro mesmo que ele tenha saído da tela agora
         for p in projectiles:
-            if not p.alive:
-                continue
-            for e in enemies:
-                if not e.alive:
+            for _, e in p.sweep_hits(enemy_grid):
+                # pode ter sido abatido por outro projétil neste quadro
+                if not is_targetable(e):
                     continue
-                if getattr(e, "state", None) == "die":
-                    continue
-                if p.collides_with_enemy(e):
-                    e.hp -= p.damage
-                    e.hurt_cooldown = 12
-                    p.alive = False
-                    try:
-                        if sound_on:
-                            sounds.hit.play()
-                    except Exception:
-                        pass
-                    if e.hp <= 0:
-                        # se inimigo tiver animação de morte, colocamos no estado "die"
-                        if getattr(e, "die_frames", None):
-                            # toca som de morte uma vez (se ainda não tocou)
-                            if not getattr(e, "death_sound_played", False):
-                                try:
-                                    if sound_on and hasattr(sounds, "enemy_die"):
-                                        sounds.enemy_die.play()
-                                    else:
-                                        if sound_on and hasattr(sounds, "ui_toggle"):
-                                            sounds.ui_toggle.play()
-                                except Exception:
-                                    pass
-                                e.death_sound_played = True
-                            e.state = "die"
-                            e.current_frame = 0
-                        else:
+                p.hit.add(e)
+                e.hp -= p.damage
+                e.hurt_cooldown = 12
+                try:
+                    if sound_on:
+                        sounds.hit.play()
+                except Exception:
+                    pass
+                if e.hp <= 0:
+                    # se inimigo tiver animação de morte, colocamos no estado "die"
+                    if getattr(e, "die_frames", None):
+                        # toca som de morte uma vez (se ainda não tocou)
+                        if not getattr(e, "death_sound_played", False):
                             try:
                                 if sound_on and hasattr(sounds, "enemy_die"):
                                     sounds.enemy_die.play()
@@ -493,7 +762,21 @@ def update():
                                         sounds.ui_toggle.play()
                             except Exception:
                                 pass
-                            e.alive = False
+                            e.death_sound_played = True
+                        e.state = "die"
+                        e.current_frame = 0
+                    else:
+                        try:
+                            if sound_on and hasattr(sounds, "enemy_die"):
+                                sounds.enemy_die.play()
+                            else:
+                                if sound_on and hasattr(sounds, "ui_toggle"):
+                                    sounds.ui_toggle.play()
+                        except Exception:
+                            pass
+                        e.alive = False
+                if len(p.hit) > p.pierce:
+                    p.alive = False
                     break
 
         # remove inimigos mortos e atualiza kills
@@ -507,7 +790,7 @@ def update():
         while kills >= kills_to_next_level:
             level_up()
         for e in enemies:
-            if player.hurt_cooldown == 0:
+            if player.hurt_cooldown == 0 and not player.invulnerable:
                 dx = player.x - e.x
                 dy = player.y - e.y
                 if math.hypot(dx, dy) < 22:
@@ -569,9 +852,7 @@ def on_mouse_move(pos):
 
 # Evento: pressionamento do mouse — trata cliques no menu e ações em jogo
 def on_mouse_down(pos):
-    global game_state, player, enemies, projectiles
-    global spawn_timer, spawn_interval, spawn_batch
-    global level, kills, kills_to_next_level
+    global game_state
     global mouse_held, last_mouse_pos, _last_sound_fallback, _bg_music_started
 
     mx, my = pos
@@ -580,15 +861,7 @@ def on_mouse_down(pos):
 
     if game_state == STATE_MENU:
         if btn_start.is_hover(pos):
-            player = Hero(3, 3)
-            enemies = [Enemy(4, 10), Enemy(8, 6), Enemy(10, 12)]
-            projectiles = []
-            spawn_timer = 0
-            spawn_interval = 180
-            spawn_batch = 1
-            level = 1
-            kills = 0
-            kills_to_next_level = 10
+            reset_game()
             try:
                 music.stop()
             except Exception:
@@ -619,7 +892,8 @@ def on_mouse_down(pos):
             if player.fire_cooldown == 0:
                 sx = player.x; sy = player.y
                 vx = mx - sx; vy = my - sy
-                proj = Projectile(sx, sy, vx, vy, speed=12, life_frames=120, damage=1)
+                proj = Projectile(sx, sy, vx, vy, speed=PROJECTILE_SPEED, life_frames=120,
+                                  damage=1, pierce=PROJECTILE_PIERCE)
                 projectiles.append(proj)
                 player.fire_cooldown = 8
                 try:
@@ -662,8 +936,18 @@ def on_mouse_up(pos):
 
 # Evento: tecla pressionada
 def on_key_down(key):
+    global autopilot, mouse_held
     if game_state != STATE_PLAYING:
         return
+    if key == keys.F2:
+        if autopilot is None:
+            autopilot = AutoPilot()
+        else:
+            # devolve o controle: para o disparo e remove a invencibilidade do bot
+            autopilot = None
+            mouse_held = False
+            player.invulnerable = False
+        return
     if key == keys.SPACE:
         if player.facing == "up":
             player.set_target(player.row - 2, player.col)
@@ -673,3 +957,33 @@ def on_key_down(key):
             player.set_target(player.row, player.col - 2)
         elif player.facing == "right":
             player.set_target(player.row, player.col + 2)
+
+# Executa partidas sem janela com o piloto automático (profiling / soak test)
+# seed fixa torna as partidas repetíveis; report_every > 0 imprime o progresso
+def run_headless(frames=6000, skill=AUTOPLAY_SKILL, invulnerable=True, seed=None,
+                 report_every=1000):
+    global autopilot, game_state, sound_on
+    sound_on = False
+    autopilot = AutoPilot(skill, invulnerable)
+    random.seed(seed)
+    reset_game()
+    game_state = STATE_PLAYING
+    ticks = 0
+    peak_enemies = 0
+    while ticks < frames and game_state == STATE_PLAYING:
+        update()
+        ticks += 1
+        peak_enemies = max(peak_enemies, len(enemies))
+        if report_every and ticks % report_every == 0:
+            print(f"frame {ticks}: level {level}, kills {kills}, enemies {len(enemies)}")
+    return {
+        "frames": ticks,
+        "level": level,
+        "kills": kills,
+        "enemies": len(enemies),
+        "peak_enemies": peak_enemies,
+        "hp": player.hp,
+    }
+
+if __name__ == "__main__":
+    print(run_headless())